@@ -6,7 +6,7 @@ On behalf of the ICANN Latin Script Diacritics Policy Development Process WG (LD
 For inquiries about the code, contact:
 Mark W. Datysgeld (mark@governanceprimer.com)
 
-This utility implements Unicode normalization (NFD) to analyze Latin script code points from ICANN's Label Generation Rules. It identifies characters that canonically decompose to ASCII base characters plus combining diacritical marks (Unicode General Category M). Results are categorized by diacritic count and output to a structured PDF report with complete Unicode technical data. The implementation uses in-memory SQLite storage and leaves no temporary files behind.
+This utility implements Unicode normalization (NFD) to analyze Latin script code points from ICANN's Label Generation Rules. It identifies characters that canonically decompose to ASCII base characters plus combining diacritical marks (Unicode General Category M). Results are categorized by diacritic count and output to a structured PDF report with complete Unicode technical data. The implementation keeps all working data in memory and writes no files other than the cached fonts and the report.
 """
 
 """
@@ -41,13 +41,14 @@ import os
 import re
 import sys
 import json
-import sqlite3
+import hashlib
 import unicodedata
 import requests
 import xml.etree.ElementTree as ET
-import tempfile
-import urllib.request
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
@@ -65,44 +66,67 @@ XML_URL = "https://www.icann.org/sites/default/files/lgr/rz-lgr-5-latin-script-2
 current_date = datetime.date.today().strftime("%Y-%m-%d")
 PDF_OUTPUT = f"LD-PDP-ASCII-Unicode-Diacritics-Report-{current_date}.pdf"
 WEB_JSON_OUTPUT = os.path.join('web', 'data', 'latest.json')
+FONT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ld-pdp-fonts')
 ASCII_LETTERS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
 THESIS_SMALL_NAME_PATTERN = re.compile(r'^LATIN SMALL LETTER [A-Z] WITH .+$')
 
 
+@lru_cache(maxsize=1024)
+def is_combining_mark(char):
+    """Return True if the character is a combining mark (Unicode General Category M)."""
+    return unicodedata.category(char)[0] == 'M'
+
+
+@lru_cache(maxsize=4096)
+def to_nfd(text):
+    """Return the NFD (canonically decomposed) form, cached per input string."""
+    return unicodedata.normalize('NFD', text)
+
+
+@lru_cache(maxsize=4096)
+def format_code_point(char):
+    """Return a single character's code point in U+XXXX format."""
+    return f"U+{ord(char):04X}"
+
+
 def format_code_point_string(characters):
     """Return one or more code points in U+XXXX format."""
-    return ' '.join(f"U+{ord(c):04X}" for c in characters)
+    return ' '.join(map(format_code_point, characters))
 
 
-def build_detailed_decomposition(characters):
-    """Build a report-friendly decomposition string with names and code points."""
-    detailed_decomp_parts = []
-    for c in characters:
-        char_name = unicodedata.name(c, 'UNKNOWN')
-        code_point = f"U+{ord(c):04X}"
-
-        # Add extra spacing around combining characters to prevent them from
-        # visually merging with surrounding text in the PDF.
-        if unicodedata.category(c).startswith('M'):
-            formatted_char = f"&nbsp;{c}&nbsp;"
-        else:
-            formatted_char = c
+@lru_cache(maxsize=4096)
+def format_detailed_decomposition_part(c):
+    """Return one report-friendly decomposition cell: "char (NAME, U+XXXX)"."""
+    char_name = unicodedata.name(c, 'UNKNOWN')
+    code_point = format_code_point(c)
+
+    # Add extra spacing around combining characters to prevent them from
+    # visually merging with surrounding text in the PDF.
+    if is_combining_mark(c):
+        formatted_char = f"&nbsp;{c}&nbsp;"
+    else:
+        formatted_char = c
 
-        detailed_decomp_parts.append(f"{formatted_char} ({char_name}, {code_point})")
+    return f"{formatted_char} ({char_name}, {code_point})"
 
-    return ' &nbsp;&nbsp;+&nbsp;&nbsp; '.join(detailed_decomp_parts)
+
+@lru_cache(maxsize=4096)
+def format_plain_decomposition_part(c):
+    """Return one plain-text decomposition cell for JSON/web output."""
+    char_name = unicodedata.name(c, 'UNKNOWN')
+    code_point = format_code_point(c)
+    formatted_char = f" {c} " if is_combining_mark(c) else c
+    return f"{formatted_char} ({char_name}, {code_point})"
+
+
+def build_detailed_decomposition(characters):
+    """Build a report-friendly decomposition string with names and code points."""
+    return ' &nbsp;&nbsp;+&nbsp;&nbsp; '.join(map(format_detailed_decomposition_part, characters))
 
 
 def build_plain_decomposition(characters):
     """Build a plain-text decomposition string for JSON/web output."""
-    parts = []
-    for c in characters:
-        char_name = unicodedata.name(c, 'UNKNOWN')
-        code_point = f"U+{ord(c):04X}"
-        formatted_char = f" {c} " if unicodedata.category(c).startswith('M') else c
-        parts.append(f"{formatted_char} ({char_name}, {code_point})")
-
-    return ' + '.join(parts)
+    return ' + '.join(map(format_plain_decomposition_part, characters))
 
 
 def print_usage():
@@ -170,186 +194,162 @@ def parse_cli_args(argv):
 
 
 
-def setup_temp_database():
-
-    # Set up an in-memory SQLite database for temporary storage. This returns: sqlite3.Connection: Database connection object
-    conn = sqlite3.connect(':memory:')
-    cursor = conn.cursor()
-    
-    # Create table for storing character data
-    cursor.execute('''
-    CREATE TABLE characters (
-        id INTEGER PRIMARY KEY,
-        character TEXT,
-        name TEXT,
-        decomposition TEXT,
-        is_latin INTEGER,
-        has_ascii_base INTEGER
-    )
-    ''')
-    
-    conn.commit()
-    return conn
-
-def store_data_in_db(characters, conn):
-    # Store character data in the database with Unicode information. Returns: int: Number of characters stored
-    cursor = conn.cursor()
-    
+def build_character_records(characters):
+    """
+    Build in-memory character records with Unicode information.
+    Returns:
+        list: One dict per character with keys character, name, is_latin
+              and has_ascii_base
+    """
+    records = []
     for char in characters:
         name = unicodedata.name(char, '')
-        decomposition = unicodedata.decomposition(char)
-        
-        # Check if it's a Latin script character
-        is_latin = 1 if 'LATIN' in name else 0
-        
-        # Store in database
-        cursor.execute(
-            'INSERT INTO characters (character, name, decomposition, is_latin, has_ascii_base) VALUES (?, ?, ?, ?, 0)',
-            (char, name, decomposition, is_latin)
-        )
-    
-    conn.commit()
-    return len(characters)
+        records.append({
+            'character': char,
+            'name': name,
+            # Check if it's a Latin script character
+            'is_latin': 'LATIN' in name,
+            'has_ascii_base': False,
+        })
+    return records
 
-def analyze_characters(conn):
+def analyze_characters(records):
     """
-    Analyze characters to find those with ASCII base + diacritics.   
+    Analyze characters to find those with ASCII base + diacritics.
+    Marks qualifying records with has_ascii_base = True.
     Returns:
         tuple: Two lists of tuples:
             - Characters with one diacritic: (character, base_char, diacritic, detailed_decomp)
             - Characters with two or more diacritics: (character, base_char, diacritics, detailed_decomp)
     """
-    cursor = conn.cursor()
-    
     # Get all Latin characters
-    cursor.execute('SELECT id, character, name, decomposition FROM characters WHERE is_latin = 1')
-    latin_chars = cursor.fetchall()
-    
+    latin_records = [record for record in records if record['is_latin']]
+
     # Separate results by number of diacritics
     one_diacritic_results = []
     two_diacritics_results = []
-    
-    for char_id, char, name, decomposition in latin_chars:
+
+    for record in latin_records:
+        char = record['character']
+
         # Get NFD (decomposed) form
-        nfd_form = unicodedata.normalize('NFD', char)
-        
-        # Check if decomposition has exactly one base character that is ASCII
-        base_is_ascii = False
-        has_diacritic = False
-        
-        if len(nfd_form) > 1:  # Has at least one combining character
-            base_char = nfd_form[0]
-            if base_char in ASCII_LETTERS:
-                base_is_ascii = True
-                # Count diacritics (combining marks)
-                diacritic_count = sum(1 for c in nfd_form[1:] if unicodedata.category(c).startswith('M'))
-                has_diacritic = diacritic_count > 0
-        
-        if base_is_ascii and has_diacritic:
-            # Update database
-            cursor.execute('UPDATE characters SET has_ascii_base = 1 WHERE id = ?', (char_id,))
-            
-            # Extract base character and diacritic separately
-            base_char = nfd_form[0]
-            
-            # Get all diacritics (combining marks)
-            diacritics = ''.join(c for c in nfd_form[1:] if unicodedata.category(c).startswith('M'))
-            detailed_decomp = build_detailed_decomposition(nfd_form)
-            
-            # Add to appropriate result list based on number of diacritics
-            if len(diacritics) == 1:
-                one_diacritic_results.append((char, base_char, diacritics, detailed_decomp))
-            else:
-                two_diacritics_results.append((char, base_char, diacritics, detailed_decomp))
-    
-    conn.commit()
+        nfd_form = to_nfd(char)
+
+        # Need an ASCII base followed by at least one combining character.
+        # Characters without a canonical decomposition come back unchanged.
+        if len(nfd_form) < 2:
+            continue
+        base_char = nfd_form[0]
+        if base_char not in ASCII_LETTERS:
+            continue
+
+        # Collect diacritics (combining marks) in a single pass
+        diacritics = ''.join([c for c in nfd_form[1:] if is_combining_mark(c)])
+        if not diacritics:
+            continue
+
+        record['has_ascii_base'] = True
+        detailed_decomp = build_detailed_decomposition(nfd_form)
+
+        # Add to appropriate result list based on number of diacritics
+        if len(diacritics) == 1:
+            one_diacritic_results.append((char, base_char, diacritics, detailed_decomp))
+        else:
+            two_diacritics_results.append((char, base_char, diacritics, detailed_decomp))
+
     return (one_diacritic_results, two_diacritics_results)
 
 
 # ===== NEW: XML parsing and classification helpers =====
+def xml_local_name(tag):
+    """Return an element tag without its '{namespace}' prefix."""
+    return tag.rpartition('}')[2]
+
+
+def collect_lgr_char(ch, latin_points, latin_sequences, blocked_variants):
+    """Collect the code points and blocked variants declared by one LGR <char> element."""
+    for child in ch.iterfind('{*}var'):
+        if child.get('type') != 'blocked':
+            continue
+
+        var_attr = child.get('cp') or child.get('cps')
+        if not var_attr:
+            continue
+
+        codes = [int(part, 16) for part in var_attr.strip().split()]
+        blocked_variants.add(''.join(chr(code) for code in codes))
+
+    # Filter non-Latin single code points by tag attribute (e.g., tag="sc:Grek").
+    # Sequences often omit 'tag'; we collect them and filter later by ASCII-base logic.
+    tag_attr = ch.get('tag')
+    if tag_attr and 'sc:Latn' not in tag_attr:
+        return
+
+    # Handle ranges, if any
+    first_cp = ch.get('first-cp')
+    last_cp = ch.get('last-cp')
+    if first_cp and last_cp:
+        start = int(first_cp, 16)
+        end = int(last_cp, 16)
+        latin_points.extend(range(start, end + 1))
+        return
+
+    # Handle single or sequence
+    cp_attr = ch.get('cp') or ch.get('cps')
+    if not cp_attr:
+        return
+    parts = cp_attr.strip().split()
+    codes = [int(p, 16) for p in parts]
+    if len(codes) == 1:
+        latin_points.append(codes[0])
+    else:
+        latin_sequences.append(codes)
+
+
 def parse_lgr_xml(url):
     """
     Parse the normative Latin RZ-LGR XML and return:
       - latin_points: list[int] of single code points in the repertoire
       - latin_sequences: list[list[int]] of repertoire sequences
       - blocked_variants: set[str] of blocked variant characters/sequences
+    The response is streamed into an incremental parser, and each <data> item
+    and top-level section is dropped from the tree once it has been read.
     """
-    resp = requests.get(url)
-    resp.raise_for_status()
-    root = ET.fromstring(resp.content)
-
-    # Find data element (namespace-agnostic; contains <char> items)
-    data_elem = None
-    for elem in root.iter():
-        if elem.tag.endswith('data'):
-            data_elem = elem
-            break
-
     latin_points = []
     latin_sequences = []
     blocked_variants = set()
-    if data_elem is None:
-        return (latin_points, latin_sequences, blocked_variants)
-
-    for ch in data_elem:
-        if not ch.tag.endswith('char'):
-            continue
 
-        for child in ch:
-            if not child.tag.endswith('var'):
-                continue
-            if child.get('type') != 'blocked':
+    with requests.get(url, stream=True) as resp:
+        resp.raise_for_status()
+        # Let urllib3 undo any gzip/deflate transfer encoding while streaming
+        resp.raw.decode_content = True
+
+        # Stack of currently open elements; the last entry is the parent of
+        # the element being closed.
+        open_elements = []
+        for event, elem in ET.iterparse(resp.raw, events=('start', 'end')):
+            if event == 'start':
+                open_elements.append(elem)
                 continue
 
-            var_attr = child.get('cp') or child.get('cps')
-            if not var_attr:
+            open_elements.pop()
+            if not open_elements:
                 continue
+            parent = open_elements[-1]
+            parent_is_data = xml_local_name(parent.tag) == 'data'
 
-            codes = [int(part, 16) for part in var_attr.strip().split()]
-            blocked_variants.add(''.join(chr(code) for code in codes))
-
-        # Filter non-Latin single code points by tag attribute (e.g., tag="sc:Grek").
-        # Sequences often omit 'tag'; we collect them and filter later by ASCII-base logic.
-        tag_attr = ch.get('tag')
-        if tag_attr and 'sc:Latn' not in tag_attr:
-            continue
+            # Only <char> items inside the (namespace-agnostic) <data> element count
+            if parent_is_data and xml_local_name(elem.tag) == 'char':
+                collect_lgr_char(elem, latin_points, latin_sequences, blocked_variants)
 
-        # Handle ranges, if any
-        first_cp = ch.get('first-cp')
-        last_cp = ch.get('last-cp')
-        if first_cp and last_cp:
-            start = int(first_cp, 16)
-            end = int(last_cp, 16)
-            for code in range(start, end + 1):
-                latin_points.append(code)
-            continue
+            # Detach finished <data> items and top-level sections (<meta>,
+            # <data>, <rules>, ...) so the tree never accumulates them
+            if parent_is_data or len(open_elements) == 1:
+                parent.remove(elem)
 
-        # Handle single or sequence
-        cp_attr = ch.get('cp') or ch.get('cps')
-        if not cp_attr:
-            continue
-        parts = cp_attr.strip().split()
-        codes = [int(p, 16) for p in parts]
-        if len(codes) == 1:
-            latin_points.append(codes[0])
-        else:
-            latin_sequences.append(codes)
-
-    # Deduplicate while preserving order
-    seen = set()
-    uniq_points = []
-    for cp in latin_points:
-        if cp not in seen:
-            seen.add(cp)
-            uniq_points.append(cp)
-
-    seen_seq = set()
-    uniq_sequences = []
-    for seq in latin_sequences:
-        t = tuple(seq)
-        if t not in seen_seq:
-            seen_seq.add(t)
-            uniq_sequences.append(seq)
+    # Deduplicate while preserving order (dicts keep insertion order)
+    uniq_points = list(dict.fromkeys(latin_points))
+    uniq_sequences = [list(seq) for seq in dict.fromkeys(map(tuple, latin_sequences))]
 
     return (uniq_points, uniq_sequences, blocked_variants)
 
@@ -365,13 +365,15 @@ def classify_sequences_ascii_base(latin_sequences):
     for codes in latin_sequences:
         chars = [chr(cp) for cp in codes]
         combined = ''.join(chars)
-        nfd = unicodedata.normalize('NFD', combined)
-        if not nfd:
+        nfd = to_nfd(combined)
+
+        # Need an ASCII base followed by at least one combining mark
+        if len(nfd) < 2:
             continue
         base = nfd[0]
         if base not in ASCII_LETTERS:
             continue
-        diacritics = ''.join(c for c in nfd[1:] if unicodedata.category(c).startswith('M'))
+        diacritics = ''.join([c for c in nfd[1:] if is_combining_mark(c)])
         if not diacritics:
             continue
 
@@ -381,21 +383,17 @@ def classify_sequences_ascii_base(latin_sequences):
     return results
 
 
-def collect_thesis_small_from_db(conn):
+def collect_thesis_small_from_records(records):
     """
     Collect Latin repertoire characters whose Unicode name matches:
     LATIN SMALL LETTER [A-Z] WITH ...
     """
-    cursor = conn.cursor()
-    cursor.execute('SELECT character, name FROM characters WHERE is_latin = 1')
-    rows = cursor.fetchall()
-
     results = []
-    for char, name in rows:
+    for char, name in get_latin_repertoire_rows(records):
         if not THESIS_SMALL_NAME_PATTERN.match(name):
             continue
 
-        nfd_form = unicodedata.normalize('NFD', char)
+        nfd_form = to_nfd(char)
         results.append((
             char,
             format_code_point_string(char),
@@ -406,11 +404,9 @@ def collect_thesis_small_from_db(conn):
     return results
 
 
-def filter_thesis_entries_to_additions(conn, thesis_entries, blocked_variants=None):
+def filter_thesis_entries_to_additions(records, thesis_entries, blocked_variants=None):
     """Keep only entries that are new to the thesis and not blocked in the RZ-LGR."""
-    cursor = conn.cursor()
-    cursor.execute('SELECT character FROM characters WHERE is_latin = 1 AND has_ascii_base = 1')
-    already_in_scope = {row[0] for row in cursor.fetchall()}
+    already_in_scope = get_base_in_scope_characters(records)
     blocked_variants = blocked_variants or set()
 
     return [
@@ -429,18 +425,18 @@ THESIS_FLAGS = {
             "blocked variants in the RZ-LGR."
         ),
         'help': "Append only additional, non-blocked characters named 'LATIN SMALL LETTER [A-Z] WITH ...'.",
-        'collector': collect_thesis_small_from_db,
+        'collector': collect_thesis_small_from_records,
     },
 }
 
 
-def collect_requested_thesis_sections(conn, enabled_flags, blocked_variants=None):
+def collect_requested_thesis_sections(records, enabled_flags, blocked_variants=None):
     """Build thesis sections requested through CLI flags."""
     thesis_sections = []
     for flag in enabled_flags:
         definition = THESIS_FLAGS[flag]
-        raw_entries = definition['collector'](conn)
-        filtered_entries = filter_thesis_entries_to_additions(conn, raw_entries, blocked_variants)
+        raw_entries = definition['collector'](records)
+        filtered_entries = filter_thesis_entries_to_additions(records, raw_entries, blocked_variants)
         thesis_sections.append({
             'flag': flag,
             'title': definition['title'],
@@ -450,36 +446,40 @@ def collect_requested_thesis_sections(conn, enabled_flags, blocked_variants=None
     return thesis_sections
 
 
-def get_latin_repertoire_rows(conn):
-    """Return all Latin repertoire single code points stored in the database."""
-    cursor = conn.cursor()
-    cursor.execute('SELECT character, name FROM characters WHERE is_latin = 1')
-    return cursor.fetchall()
+def get_latin_repertoire_rows(records):
+    """Return (character, name) for all Latin repertoire single code points."""
+    return [
+        (record['character'], record['name'])
+        for record in records
+        if record['is_latin']
+    ]
 
 
-def get_base_in_scope_characters(conn):
+def get_base_in_scope_characters(records):
     """Return the default decomposable in-scope character set."""
-    cursor = conn.cursor()
-    cursor.execute('SELECT character FROM characters WHERE is_latin = 1 AND has_ascii_base = 1')
-    return {row[0] for row in cursor.fetchall()}
+    return {
+        record['character']
+        for record in records
+        if record['is_latin'] and record['has_ascii_base']
+    }
 
 
-def build_scope_snapshot(conn, thesis_sections=None):
+def build_scope_snapshot(records, thesis_sections=None):
     """Build the effective in-scope set and appendix for a given thesis selection."""
     thesis_sections = thesis_sections or []
-    effective_in_scope = set(get_base_in_scope_characters(conn))
+    effective_in_scope = get_base_in_scope_characters(records)
 
     for section in thesis_sections:
         effective_in_scope.update(entry[0] for entry in section.get('entries', []))
 
-    repertoire_rows = get_latin_repertoire_rows(conn)
+    repertoire_rows = get_latin_repertoire_rows(records)
     out_of_scope_index = []
     for ch, name in repertoire_rows:
         if ch in ASCII_LETTERS:
             continue
         if ch in effective_in_scope:
             continue
-        out_of_scope_index.append((ch, f"U+{ord(ch):04X}", name))
+        out_of_scope_index.append((ch, format_code_point(ch), name))
 
     return {
         'in_scope_characters': effective_in_scope,
@@ -509,7 +509,7 @@ def serialize_analysis_rows(results):
     """Serialize standard analysis rows for JSON/web output."""
     rows = []
     for char, base_char, diacritics, _detailed_decomp in results:
-        decomposition_source = list(char) if len(char) > 1 else unicodedata.normalize('NFD', char)
+        decomposition_source = list(char) if len(char) > 1 else to_nfd(char)
         rows.append({
             'character': char,
             'codePoints': format_code_point_string(char),
@@ -528,7 +528,7 @@ def serialize_thesis_rows(entries):
             'character': char,
             'codePoint': code_point,
             'name': name,
-            'details': build_plain_decomposition(unicodedata.normalize('NFD', char)),
+            'details': build_plain_decomposition(to_nfd(char)),
         })
     return rows
 
@@ -645,15 +645,15 @@ def build_web_mode(mode_id, label, description, enabled_flags, primary_sections,
     }
 
 
-def build_web_report_payload(conn, results_tuple, sequences_ascii_base, latin_sequences, thesis_sections_by_flag):
+def build_web_report_payload(records, results_tuple, sequences_ascii_base, latin_sequences, thesis_sections_by_flag):
     """Build the full JSON payload consumed by the compact web frontend."""
     primary_sections = build_primary_web_sections(results_tuple, sequences_ascii_base)
     base_plus_small_sections = []
     if '-thesis-small' in thesis_sections_by_flag:
         base_plus_small_sections.append(thesis_sections_by_flag['-thesis-small'])
 
-    base_scope_snapshot = build_scope_snapshot(conn, [])
-    base_plus_small_scope_snapshot = build_scope_snapshot(conn, base_plus_small_sections)
+    base_scope_snapshot = build_scope_snapshot(records, [])
+    base_plus_small_scope_snapshot = build_scope_snapshot(records, base_plus_small_sections)
 
     return {
         'generatedAt': datetime.datetime.now().isoformat(),
@@ -702,33 +702,57 @@ def write_web_json_report(output_path, payload):
     return output_path
 
 
+def get_font_cache_path(url):
+    """Return the cache path for a font URL (named by the SHA-256 of the URL)."""
+    extension = os.path.splitext(url)[1]
+    digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(FONT_CACHE_DIR, digest + extension)
+
+
+def download_font(url, font_path):
+    """Download a font file, only moving it into place once complete."""
+    os.makedirs(os.path.dirname(font_path), exist_ok=True)
+    response = requests.get(url, timeout=60)
+    response.raise_for_status()
+
+    partial_path = font_path + '.part'
+    with open(partial_path, 'wb') as handle:
+        handle.write(response.content)
+    os.replace(partial_path, font_path)
+
+
 def setup_fonts():
     """
     Set up fonts for PDF generation. Downloads Noto Sans for optimal Unicode support, with Arial as a reliable fallback for all platforms.
+    Downloaded fonts are cached in FONT_CACHE_DIR and reused across runs.
     Returns:
         tuple: (main_font_name, bold_font_name) to use in the PDF
     """
     # Noto Sans as the primary choice for Unicode support
     font_url = "https://github.com/googlefonts/noto-fonts/raw/main/hinted/ttf/NotoSans/NotoSans-Regular.ttf"
     bold_font_url = "https://github.com/googlefonts/noto-fonts/raw/main/hinted/ttf/NotoSans/NotoSans-Bold.ttf"
-    
-    temp_dir = tempfile.gettempdir()
-    font_path = os.path.join(temp_dir, "NotoSans-Regular.ttf")
-    bold_font_path = os.path.join(temp_dir, "NotoSans-Bold.ttf")
-    
+
+    # Already registered in this process; skip re-parsing the TTF files
+    registered_fonts = pdfmetrics.getRegisteredFontNames()
+    if 'NotoSans' in registered_fonts and 'NotoSans-Bold' in registered_fonts:
+        return ('NotoSans', 'NotoSans-Bold')
+
+    font_path = get_font_cache_path(font_url)
+    bold_font_path = get_font_cache_path(bold_font_url)
+
     # Default to Arial if Noto Sans fails
     main_font = 'Arial'
     bold_font = 'Arial-Bold'
-    
+
     try:
-        # Download and register Noto Sans fonts
+        # Download (first run only) and register Noto Sans fonts
         if not os.path.exists(font_path):
             print("Downloading Noto Sans font for optimal Unicode support...")
-            urllib.request.urlretrieve(font_url, font_path)
-            
+            download_font(font_url, font_path)
+
         if not os.path.exists(bold_font_path):
-            urllib.request.urlretrieve(bold_font_url, bold_font_path)
-            
+            download_font(bold_font_url, bold_font_path)
+
         # Register the fonts with ReportLab
         pdfmetrics.registerFont(TTFont('NotoSans', font_path))
         pdfmetrics.registerFont(TTFont('NotoSans-Bold', bold_font_path))
@@ -760,12 +784,70 @@ class PDFDocTemplate(BaseDocTemplate):
         template = PageTemplate(id='normal', frames=[frame])
         self.addPageTemplates([template])
 
-def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index, coverage_summary, output_filename, thesis_sections=None):
+def build_analysis_table_data(results, header, main_font, char_style, simple_decomp_style, detailed_decomp_style):
+    """
+    Build the header row plus one row of Paragraph cells per analysis result.
+    Args:
+        results (list): (character, base_char, diacritics, detailed_decomp) tuples
+        header (list): Header row labels
+    Returns:
+        list: Table data ready to pass to reportlab's Table
+    """
+    table_data = [header]
+
+    # The markup only varies by cell text, so bind the font into the templates once
+    char_template = "<para align='center'><font face='" + main_font + "' size='16'>%s</font><br/><font size='8'>%s</font></para>"
+    simple_template = "<para align='center'><font face='" + main_font + "' size='14'>%s</font></para>"
+    detailed_template = "<font face='" + main_font + "'>%s</font>"
+
+    for char, base_char, diacritics, detailed_decomp in results:
+        # For the character column, show both the character and its code point(s)
+        code_point = format_code_point_string(char)
+        char_cell = Paragraph(char_template % (char, code_point), char_style)
+
+        base_cell = Paragraph(simple_template % base_char, simple_decomp_style)
+
+        diacritics_cell = Paragraph(simple_template % diacritics, simple_decomp_style)
+
+        detailed_decomp_cell = Paragraph(detailed_template % detailed_decomp, detailed_decomp_style)
+
+        table_data.append([char_cell, base_cell, diacritics_cell, detailed_decomp_cell])
+
+    return table_data
+
+def build_results_table_style(bold_font, row_count, body_font_size=10):
+    """
+    Return the shared TableStyle for result tables: highlighted bold header,
+    grid, and alternating grey rows.
+    """
+    commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#32CCCC')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),  # Center align header text
+        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),   # Left align content text
+        ('FONTNAME', (0, 0), (-1, 0), bold_font),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTSIZE', (0, 1), (-1, -1), body_font_size),
+    ]
+
+    # Add alternating row colors
+    commands.extend(
+        ('BACKGROUND', (0, i), (-1, i), colors.lightgrey)
+        for i in range(2, row_count, 2)
+    )
+    return TableStyle(commands)
+
+def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index, coverage_summary, output_filename, thesis_sections=None, fonts=None):
     """
     Generate a PDF report with the analysis results.
     Args:
         results_tuple (tuple): Tuple containing two lists of character data
         output_filename (str): Name of the output PDF file
+        fonts (tuple): Optional (main_font_name, bold_font_name) from setup_fonts
     """
     one_diacritic_results, two_diacritics_results = results_tuple
     thesis_sections = thesis_sections or []
@@ -777,11 +859,12 @@ def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index,
     print(f"Found {len(one_diacritic_results)} characters with one diacritic")
     print(f"Found {len(two_diacritics_results)} characters with two diacritics")
     
-    # Set up fonts for the PDF
-    main_font, bold_font = setup_fonts()
+    # Set up fonts for the PDF (unless the caller already did)
+    main_font, bold_font = fonts or setup_fonts()
     
-    # Create PDF document with hyperlink support
-    doc = PDFDocTemplate(output_filename, pagesize=letter)
+    # Create PDF document with hyperlink support, rendered into memory first
+    pdf_buffer = BytesIO()
+    doc = PDFDocTemplate(pdf_buffer, pagesize=letter)
     styles = getSampleStyleSheet()
     
     # Create custom styles with hyperlink support
@@ -854,18 +937,14 @@ def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index,
 
         if entries:
             thesis_table_data = [["Character", "Code point", "Name", "Technical Details"]]
+            char_template = "<para align='center'><font face='" + main_font + "' size='16'>%s</font></para>"
+            detailed_template = "<font face='" + main_font + "'>%s</font>"
 
             for char, code_point, name, detailed_decomp in entries:
-                char_cell = Paragraph(
-                    f"<para align='center'><font face='{main_font}' size='16'>{char}</font></para>",
-                    custom_style,
-                )
+                char_cell = Paragraph(char_template % char, custom_style)
                 code_point_cell = Paragraph(code_point, detailed_decomp_style)
                 name_cell = Paragraph(name, detailed_decomp_style)
-                detailed_decomp_cell = Paragraph(
-                    f"<font face='{main_font}'>{detailed_decomp}</font>",
-                    detailed_decomp_style,
-                )
+                detailed_decomp_cell = Paragraph(detailed_template % detailed_decomp, detailed_decomp_style)
                 thesis_table_data.append([
                     char_cell,
                     code_point_cell,
@@ -874,25 +953,7 @@ def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index,
                 ])
 
             thesis_table = Table(thesis_table_data, colWidths=[60, 80, 190, 200])
-            thesis_table_style = TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#32CCCC')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), bold_font),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ])
-
-            for i in range(1, len(thesis_table_data)):
-                if i % 2 == 0:
-                    thesis_table_style.add('BACKGROUND', (0, i), (-1, i), colors.lightgrey)
-
-            thesis_table.setStyle(thesis_table_style)
+            thesis_table.setStyle(build_results_table_style(bold_font, len(thesis_table_data), body_font_size=9))
             content.append(thesis_table)
         else:
             content.append(Paragraph("No characters matched this thesis.", custom_style))
@@ -903,46 +964,20 @@ def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index,
     content.append(Paragraph(f"Characters with One Diacritic Mark ({len(one_diacritic_results)})", heading2_style))
     
     # Create table data for one diacritic
-    table1_data = [["Character", "Base", "Diacritic", "Technical Details"]]  # Header row
-    
-    # Process each result into paragraphs
-    for char, base_char, diacritic, detailed_decomp in one_diacritic_results:
-        # For the character column, show both the character and its code point
-        code_point = f"U+{ord(char):04X}"
-        char_cell = Paragraph(f"<para align='center'><font face='{main_font}' size='16'>{char}</font><br/><font size='8'>{code_point}</font></para>", custom_style)
-        
-        base_cell = Paragraph(f"<para align='center'><font face='{main_font}' size='14'>{base_char}</font></para>", simple_decomp_style)
-
-        diacritic_cell = Paragraph(f"<para align='center'><font face='{main_font}' size='14'>{diacritic}</font></para>", simple_decomp_style)
-
-        detailed_decomp_cell = Paragraph(f"<font face='{main_font}'>{detailed_decomp}</font>", detailed_decomp_style)
-        
-        table1_data.append([char_cell, base_cell, diacritic_cell, detailed_decomp_cell])
+    table1_data = build_analysis_table_data(
+        one_diacritic_results,
+        ["Character", "Base", "Diacritic", "Technical Details"],
+        main_font,
+        custom_style,
+        simple_decomp_style,
+        detailed_decomp_style,
+    )
     
     # Create table with four columns
     table1 = Table(table1_data, colWidths=[80, 70, 70, 310])
     
     # Style the table
-    table1_style = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#32CCCC')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),  # Center align header text
-        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),   # Left align content text
-        ('FONTNAME', (0, 0), (-1, 0), bold_font),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-    ])
-    
-    # Add alternating row colors
-    for i in range(1, len(table1_data)):
-        if i % 2 == 0:
-            table1_style.add('BACKGROUND', (0, i), (-1, i), colors.lightgrey)
-    
-    table1.setStyle(table1_style)
+    table1.setStyle(build_results_table_style(bold_font, len(table1_data)))
     content.append(table1)
     
     # Add space between tables
@@ -953,46 +988,20 @@ def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index,
         content.append(Paragraph(f"Characters with Two Diacritic Marks ({len(two_diacritics_results)})", heading2_style))
         
         # Create table data for two diacritics
-        table2_data = [["Character", "Base", "Diacritics", "Technical Details"]]  # Header row
-        
-        # Process each result into paragraphs
-        for char, base_char, diacritics, detailed_decomp in two_diacritics_results:
-
-            code_point = f"U+{ord(char):04X}"
-            char_cell = Paragraph(f"<para align='center'><font face='{main_font}' size='16'>{char}</font><br/><font size='8'>{code_point}</font></para>", custom_style)
-            
-            base_cell = Paragraph(f"<para align='center'><font face='{main_font}' size='14'>{base_char}</font></para>", simple_decomp_style)
-            
-            diacritics_cell = Paragraph(f"<para align='center'><font face='{main_font}' size='14'>{diacritics}</font></para>", simple_decomp_style)
-
-            detailed_decomp_cell = Paragraph(f"<font face='{main_font}'>{detailed_decomp}</font>", detailed_decomp_style)
-            
-            table2_data.append([char_cell, base_cell, diacritics_cell, detailed_decomp_cell])
+        table2_data = build_analysis_table_data(
+            two_diacritics_results,
+            ["Character", "Base", "Diacritics", "Technical Details"],
+            main_font,
+            custom_style,
+            simple_decomp_style,
+            detailed_decomp_style,
+        )
         
         # Create table with four columns
         table2 = Table(table2_data, colWidths=[80, 70, 70, 310])
         
         # Style the table
-        table2_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#32CCCC')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),  # Center align header text
-            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),   # Left align content text
-            ('FONTNAME', (0, 0), (-1, 0), bold_font),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ])
-        
-        # Add alternating row colors
-        for i in range(1, len(table2_data)):
-            if i % 2 == 0:
-                table2_style.add('BACKGROUND', (0, i), (-1, i), colors.lightgrey)
-        
-        table2.setStyle(table2_style)
+        table2.setStyle(build_results_table_style(bold_font, len(table2_data)))
         content.append(table2)
     else:
         content.append(Paragraph("No characters with two or more diacritic marks were found.", custom_style))
@@ -1004,48 +1013,20 @@ def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index,
     content.append(Paragraph(f"Other occurrences in the Latin RZ LGR ({len(other_lgr_occurrences)})", heading2_style))
     
     # Create table data for other LGR occurrences
-    table3_data = [["Character", "Base", "Diacritic", "Technical Details"]]  # Header row
-    
-    # Process each result into paragraphs
-    for char, base_char, diacritic, detailed_decomp in other_lgr_occurrences:
-        # For the character column, show both the character and its code point
-        # We need to calculate the code point of the combined character
-        combined_code_point_str = format_code_point_string(char)
-        
-        char_cell = Paragraph(f"<para align='center'><font face='{main_font}' size='16'>{char}</font><br/><font size='8'>{combined_code_point_str}</font></para>", custom_style)
-        
-        base_cell = Paragraph(f"<para align='center'><font face='{main_font}' size='14'>{base_char}</font></para>", simple_decomp_style)
-        
-        diacritic_cell = Paragraph(f"<para align='center'><font face='{main_font}' size='14'>{diacritic}</font></para>", simple_decomp_style)
-        
-        detailed_decomp_cell = Paragraph(f"<font face='{main_font}'>{detailed_decomp}</font>", detailed_decomp_style)
-        
-        table3_data.append([char_cell, base_cell, diacritic_cell, detailed_decomp_cell])
+    table3_data = build_analysis_table_data(
+        other_lgr_occurrences,
+        ["Character", "Base", "Diacritic", "Technical Details"],
+        main_font,
+        custom_style,
+        simple_decomp_style,
+        detailed_decomp_style,
+    )
     
     # Create table with four columns
     table3 = Table(table3_data, colWidths=[80, 70, 70, 310])
     
     # Style the table
-    table3_style = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#32CCCC')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),  # Center align header text
-        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),   # Left align content text
-        ('FONTNAME', (0, 0), (-1, 0), bold_font),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-    ])
-    
-    # Add alternating row colors
-    for i in range(1, len(table3_data)):
-        if i % 2 == 0:
-            table3_style.add('BACKGROUND', (0, i), (-1, i), colors.lightgrey)
-    
-    table3.setStyle(table3_style)
+    table3.setStyle(build_results_table_style(bold_font, len(table3_data)))
     content.append(table3)
 
     # Coverage summary
@@ -1072,11 +1053,12 @@ def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index,
     content.append(Paragraph(f"Appendix: Out of scope under the current thesis ({len(out_of_scope_index)})", heading2_style))
 
     appendix_data = [["Glyph", "Code point", "Name"]]
+    glyph_template = "<para align='center'><font face='" + main_font + "' size='12'>%s</font></para>"
     for ch, cp, name in out_of_scope_index:
         appendix_data.append([
-            Paragraph(f"<para align='center'><font face='{main_font}' size='12'>{ch}</font></para>", detailed_decomp_style),
-            Paragraph(f"{cp}", detailed_decomp_style),
-            Paragraph(f"{name}", detailed_decomp_style),
+            Paragraph(glyph_template % ch, detailed_decomp_style),
+            Paragraph(cp, detailed_decomp_style),
+            Paragraph(name, detailed_decomp_style),
         ])
 
     appendix_table = Table(appendix_data, colWidths=[60, 90, 380])
@@ -1093,46 +1075,52 @@ def generate_pdf_report(results_tuple, sequences_ascii_base, out_of_scope_index,
     appendix_table.setStyle(appendix_style)
     content.append(appendix_table)
     
-    # Build PDF
+    # Build PDF, then write it out in one go so a failed build leaves no partial file
     doc.build(content)
+    with open(output_filename, 'wb') as handle:
+        handle.write(pdf_buffer.getbuffer())
     
     return output_filename
 
 def main():
     """Main execution function."""
+    # Fonts are fetched in the background and only awaited when the PDF is built
+    executor = ThreadPoolExecutor(max_workers=1)
+    fonts_future = None
     try:
         cli_options = parse_cli_args(sys.argv)
         enabled_thesis_flags = cli_options['enabled_thesis_flags']
         json_output = cli_options['json_output']
         json_only = cli_options['json_only']
 
+        # The font download is independent of the analysis, so start it first
+        if not json_only:
+            fonts_future = executor.submit(setup_fonts)
+
         # Step 1: Parse normative XML (Latin RZ-LGR) — authoritative repertoire
         latin_points, latin_sequences, blocked_variants = parse_lgr_xml(XML_URL)
         characters = [chr(cp) for cp in latin_points]
         
-        # Step 2: Set up temporary database
-        conn = setup_temp_database()
-        
-        # Step 3: Store data in database
-        store_data_in_db(characters, conn)
-        
-        # Step 4: Analyze characters
-        results_tuple = analyze_characters(conn)
+        # Step 2: Build in-memory character records
+        records = build_character_records(characters)
+
+        # Step 3: Analyze characters
+        results_tuple = analyze_characters(records)
         one_diacritic_results, two_diacritics_results = results_tuple
 
         # Derive sequences (ASCII base) from XML repertoire sequences
         sequences_ascii_base = classify_sequences_ascii_base(latin_sequences)
 
         # Collect requested thesis sections
-        thesis_sections = collect_requested_thesis_sections(conn, enabled_thesis_flags, blocked_variants)
-        web_thesis_sections = collect_requested_thesis_sections(conn, list(THESIS_FLAGS.keys()), blocked_variants)
+        thesis_sections = collect_requested_thesis_sections(records, enabled_thesis_flags, blocked_variants)
+        web_thesis_sections = collect_requested_thesis_sections(records, list(THESIS_FLAGS.keys()), blocked_variants)
         web_thesis_sections_by_flag = {
             section['flag']: section
             for section in web_thesis_sections
         }
 
         # Build out-of-scope index and coverage counts for the currently enabled thesis flags
-        current_scope_snapshot = build_scope_snapshot(conn, thesis_sections)
+        current_scope_snapshot = build_scope_snapshot(records, thesis_sections)
         out_of_scope_index = current_scope_snapshot['out_of_scope_index']
         base_counts = current_scope_snapshot['coverage_counts']
         coverage_summary = {
@@ -1155,7 +1143,7 @@ def main():
 
         if json_output:
             payload = build_web_report_payload(
-                conn,
+                records,
                 results_tuple,
                 sequences_ascii_base,
                 latin_sequences,
@@ -1165,7 +1153,7 @@ def main():
             print(f"Web JSON data saved to: {json_path}")
         
         if not json_only:
-            # Step 5: Generate PDF report
+            # Step 4: Generate PDF report
             pdf_path = generate_pdf_report(
                 results_tuple,
                 sequences_ascii_base,
@@ -1173,6 +1161,7 @@ def main():
                 coverage_summary,
                 PDF_OUTPUT,
                 thesis_sections=thesis_sections,
+                fonts=fonts_future.result(),
             )
             print(f"Analysis complete! PDF report saved to: {pdf_path}")
         elif json_output:
@@ -1181,9 +1170,10 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
     finally:
-        # Cleanup (database is in-memory only)
-        if 'conn' in locals():
-            conn.close()
+        # Don't hold up error reporting on a font download nobody will use
+        if fonts_future is not None:
+            fonts_future.cancel()
+        executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":